@@ -1,16 +1,30 @@
 """Extract Claude Code metrics from GitHub Actions logs."""
 
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
+import orjson
 from loguru import logger
 
 from src.github_client import get_workflow_runs
-from src.processor import process_runs
+from src.log_cache import DEFAULT_CACHE_DIR
+from src.processor import DEFAULT_CONCURRENCY, process_runs
 from src.report_generator import generate_csv_report
 
 
+def _write_json(results: list[dict], output_file: Path) -> None:
+    """Write results to a JSON file.
+
+    Args:
+        results: List of metrics dictionaries
+        output_file: Output JSON file path
+    """
+    output_file.write_bytes(
+        orjson.dumps(results, option=orjson.OPT_INDENT_2),
+    )
+
+
 @click.command()
 @click.option(
     "--repo",
@@ -36,6 +50,23 @@ from src.report_generator import generate_csv_report
     default=1000,
     help="Maximum number of runs to fetch",
 )
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    help="Maximum number of logs fetched concurrently",
+)
+@click.option(
+    "--cache-dir",
+    type=Path,
+    default=DEFAULT_CACHE_DIR,
+    help="Directory for caching logs of completed runs",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always fetch logs without reading or writing the cache",
+)
 @click.option(
     "--csv-output",
     type=Path,
@@ -63,6 +94,9 @@ def main(
     workflow: str,
     days: int = 30,
     limit: int = 1000,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    no_cache: bool = False,
     csv_output: Path = Path("claude_review_report.csv"),
     json_output: Path = Path("claude_metrics_output.json"),
     no_csv: bool = False,
@@ -76,6 +110,13 @@ def main(
         days (int): Number of days to look back
         limit (int, optional): \
             Maximum number of runs to fetch. Defaults to 1000.
+        concurrency (int, optional): \
+            Maximum number of logs fetched concurrently. Defaults to 16.
+        cache_dir (Path, optional): \
+            Directory for caching logs of completed runs. \
+            Defaults to ~/.cache/claude-metrics.
+        no_cache (bool, optional): \
+            Always fetch logs without using the cache. Defaults to False.
         csv_output (Path, optional): \
             CSV output file path. Defaults to Path("claude_review_report.csv").
         json_output (Path, optional): \
@@ -93,16 +134,37 @@ def main(
     runs = get_workflow_runs(workflow, limit, days, repo)
     logger.info(f"Found {len(runs)} runs in the last {days} days")
 
-    results = process_runs(runs, repo)
+    results = process_runs(
+        runs,
+        repo,
+        concurrency,
+        None if no_cache else cache_dir,
+    )
 
-    if not no_csv:
-        generate_csv_report(results, csv_output, repo)
-        logger.info(f"CSV report generated: {csv_output.as_posix()}")
+    # Neither output depends on the other, so write them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        csv_future = (
+            None
+            if no_csv
+            else executor.submit(
+                generate_csv_report,
+                results,
+                csv_output,
+                repo,
+            )
+        )
+        json_future = (
+            None
+            if no_json
+            else executor.submit(_write_json, results, json_output)
+        )
 
-    if not no_json:
-        with json_output.open("w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        logger.info(f"JSON output saved: {json_output.as_posix()}")
+        if csv_future is not None:
+            csv_future.result()
+            logger.info(f"CSV report generated: {csv_output.as_posix()}")
+        if json_future is not None:
+            json_future.result()
+            logger.info(f"JSON output saved: {json_output.as_posix()}")
 
 
 if __name__ == "__main__":
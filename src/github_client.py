@@ -1,12 +1,17 @@
-"""GitHub API client for workflow runs."""
+"""GitHub API client for workflow runs and pull requests."""
 
-import json
 import subprocess
 import sys
 from datetime import UTC, datetime, timedelta
 
+import orjson
 from loguru import logger
 
+# Pull requests looked up per GraphQL request
+PR_BATCH_SIZE = 50
+
+_PR_FIELDS = "number author { login } commits { totalCount } changedFiles"
+
 
 def get_workflow_runs(
     workflow_name: str,
@@ -28,6 +33,7 @@ def get_workflow_runs(
     Raises:
         SystemExit: If command execution fails
     """
+    cutoff_date = datetime.now(UTC) - timedelta(days=days)
     cmd = [
         "gh",
         "run",
@@ -38,32 +44,116 @@ def get_workflow_runs(
         str(limit),
         "--repo",
         repo,
+        # Let GitHub drop older runs before they count against the limit
+        "--created",
+        f">={cutoff_date.date().isoformat()}",
         "--json",
-        "databaseId,displayTitle,headBranch,conclusion,createdAt,number",
+        "databaseId,displayTitle,headBranch,conclusion,createdAt,number,"
+        "startedAt,updatedAt,attempt",
     ]
     try:
-        runs_json = subprocess.check_output(cmd, text=True)  # noqa: S603
-        runs = json.loads(runs_json)
+        runs_json = subprocess.check_output(  # noqa: S603
+            cmd,
+            stdin=subprocess.DEVNULL,
+        )
+        runs = orjson.loads(runs_json)
     except Exception as e:
         logger.error(f"Error getting run list: {e}")
         sys.exit(1)
 
-    # Filter runs by date
-    cutoff_date = datetime.now(UTC) - timedelta(days=days)
-    filtered_runs = []
-    for run in runs:
-        created_at = run.get("createdAt", "")
-        if created_at:
-            try:
-                run_date = datetime.fromisoformat(
-                    created_at.replace("Z", "+00:00"),
-                )
-                if run_date >= cutoff_date:
-                    filtered_runs.append(run)
-            except (ValueError, AttributeError):
-                # If date parsing fails, include it anyway
-                filtered_runs.append(run)
-        else:
-            filtered_runs.append(run)
+    # The server-side filter only has day granularity, so trim the rest
+    # here. GitHub returns UTC timestamps in ISO 8601
+    # ("2025-12-22T08:50:26Z"), which sort lexicographically, so plain
+    # string comparison avoids parsing every createdAt.
+    cutoff_iso = cutoff_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+    filtered_runs = [
+        run
+        for run in runs
+        if not run.get("createdAt") or run["createdAt"] >= cutoff_iso
+    ]
 
     return filtered_runs
+
+
+def _build_pull_requests_query(pr_numbers: list[int]) -> str:
+    """Build a GraphQL query fetching several pull requests at once.
+
+    Args:
+        pr_numbers: Pull request numbers
+
+    Returns:
+        GraphQL query string with one aliased field per pull request
+    """
+    fields = " ".join(
+        f"pr{number}: pullRequest(number: {number}) {{ {_PR_FIELDS} }}"
+        for number in pr_numbers
+    )
+    return (
+        "query($owner: String!, $name: String!) "
+        f"{{ repository(owner: $owner, name: $name) {{ {fields} }} }}"
+    )
+
+
+def get_pull_requests(repo: str, pr_numbers: list[int]) -> dict[int, dict]:
+    """Get pull request metadata in batched GraphQL requests.
+
+    Pull requests that cannot be fetched are left out of the result
+    rather than aborting the whole run.
+
+    Args:
+        repo: Repository name (owner/repo)
+        pr_numbers: Pull request numbers to look up
+
+    Returns:
+        Mapping of PR number to a dictionary with pr_author,
+        total_commits and changed_files
+    """
+    owner, name = repo.split("/", 1)
+    pull_requests: dict[int, dict] = {}
+
+    for i in range(0, len(pr_numbers), PR_BATCH_SIZE):
+        batch = pr_numbers[i : i + PR_BATCH_SIZE]
+        cmd = [
+            "gh",
+            "api",
+            "graphql",
+            "-f",
+            f"owner={owner}",
+            "-f",
+            f"name={name}",
+            "-f",
+            f"query={_build_pull_requests_query(batch)}",
+        ]
+        # gh exits non-zero when some PRs are missing, but still prints
+        # the data for the ones that were found
+        proc = subprocess.run(  # noqa: S603
+            cmd,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            check=False,
+        )
+        try:
+            response = orjson.loads(proc.stdout)
+            repository = response["data"]["repository"] or {}
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning(f"Error getting pull requests {batch}: {e}")
+            continue
+        if proc.returncode:
+            logger.warning(
+                f"Some pull requests could not be fetched: "
+                f"{proc.stderr.decode(errors='replace').strip()}",
+            )
+
+        for node in repository.values():
+            if not node:
+                continue
+            author = node.get("author") or {}
+            pull_requests[node["number"]] = {
+                "pr_author": author.get("login"),
+                "total_commits": (node.get("commits") or {}).get(
+                    "totalCount",
+                ),
+                "changed_files": node.get("changedFiles"),
+            }
+
+    return pull_requests
@@ -0,0 +1,292 @@
+"""Filesystem cache for GitHub Actions run logs."""
+
+import asyncio
+import gzip
+import subprocess
+import tempfile
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import aclosing
+from pathlib import Path
+from typing import IO
+
+from loguru import logger
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "claude-metrics"
+
+# Size of each read from gh's stdout; lines are split out of the chunks,
+# so no single line is limited in length
+_READ_CHUNK_BYTES = 256 * 1024
+
+# Logs of runs with one of these conclusions can no longer change.
+# Other final conclusions (cancelled, skipped, ...) leave no result, so
+# their logs are never fetched in the first place.
+CACHEABLE_CONCLUSIONS = frozenset({"success", "failure"})
+
+
+class CacheReadError(Exception):
+    """A cached log could not be read and has been removed."""
+
+
+class _CacheWriter:
+    """Write a log into the cache, publishing it only once complete.
+
+    Caching is best effort: any I/O error is logged and the partially
+    written entry is dropped without interrupting the log stream.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open a temporary file next to the cache entry.
+
+        Args:
+            path: Final cache file path
+        """
+        self._path = path
+        self._tmp: IO[bytes] | None = None
+        self._gz: gzip.GzipFile | None = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._tmp = tempfile.NamedTemporaryFile(
+                dir=path.parent,
+                prefix=f".{path.name}.",
+                delete=False,
+            )
+            self._gz = gzip.GzipFile(
+                fileobj=self._tmp,
+                mode="wb",
+                compresslevel=6,
+            )
+        except OSError as e:
+            self._fail(e)
+
+    def _fail(self, error: OSError) -> None:
+        """Log a cache write error and drop the partial entry.
+
+        Args:
+            error: The error that occurred
+        """
+        logger.warning(f"Failed to write cache {self._path}: {error}")
+        self.discard()
+
+    def write(self, data: bytes) -> None:
+        """Append raw log data.
+
+        Args:
+            data: Log data as read from gh, possibly several lines
+        """
+        if self._gz is None:
+            return
+        try:
+            self._gz.write(data)
+        except OSError as e:
+            self._fail(e)
+
+    def commit(self) -> None:
+        """Atomically move the written log into place."""
+        if self._gz is None or self._tmp is None:
+            return
+        try:
+            self._gz.close()
+            self._tmp.close()
+            Path(self._tmp.name).replace(self._path)
+            self._gz = self._tmp = None
+        except OSError as e:
+            self._fail(e)
+
+    def discard(self) -> None:
+        """Remove the partially written log, if any."""
+        gz, tmp = self._gz, self._tmp
+        self._gz = self._tmp = None
+        try:
+            if gz is not None:
+                gz.close()
+            if tmp is not None:
+                tmp.close()
+                Path(tmp.name).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to clean up cache {self._path}: {e}")
+
+
+def _pop_lines(buf: bytearray) -> list[bytes]:
+    """Remove all complete lines from the front of a buffer.
+
+    Line boundaries are located with ``bytearray.find`` and each line is
+    copied out of a memoryview exactly once; the incomplete tail stays
+    in the buffer for the next chunk.
+
+    Args:
+        buf: Buffer of raw log data, modified in place
+
+    Returns:
+        Complete lines including their trailing newline
+    """
+    lines = []
+    start = 0
+    with memoryview(buf) as view:
+        end = buf.find(b"\n")
+        while end != -1:
+            lines.append(bytes(view[start : end + 1]))
+            start = end + 1
+            end = buf.find(b"\n", start)
+    del buf[:start]
+    return lines
+
+
+async def _read_lines(
+    stream: asyncio.StreamReader,
+    writer: _CacheWriter | None,
+) -> AsyncGenerator[bytes, None]:
+    """Split a stream into lines, copying the raw data to the cache.
+
+    Args:
+        stream: Output stream of the gh process
+        writer: Cache writer to copy the data to, or None
+
+    Yields:
+        Raw log lines including their trailing newline
+    """
+    buf = bytearray()
+    while chunk := await stream.read(_READ_CHUNK_BYTES):
+        if writer is not None:
+            writer.write(chunk)
+        buf += chunk
+        for line in _pop_lines(buf):
+            yield line
+    if buf:
+        yield bytes(buf)
+
+
+async def _stream_log(
+    run_id: str,
+    repo: str,
+    attempt: int | None,
+    cache_path: Path | None,
+) -> AsyncGenerator[bytes, None]:
+    """Stream a run log from the GitHub CLI line by line.
+
+    Lines are passed through as raw bytes; decoding is left to the
+    caller, which only needs it for the few fields it extracts.
+
+    Args:
+        run_id: GitHub Actions run ID
+        repo: Repository name (owner/repo)
+        attempt: Run attempt to fetch, or None for the latest one
+        cache_path: Cache file to populate, or None to skip caching
+
+    Yields:
+        Raw log lines including their trailing newline
+
+    Raises:
+        subprocess.CalledProcessError: If the gh command fails
+    """
+    cmd = ["gh", "run", "view", run_id, "--log", "--repo", repo]
+    if attempt is not None:
+        cmd += ["--attempt", str(attempt)]
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    # Only create the temporary cache file once gh is running, and
+    # inside the try so that it is always discarded on failure
+    writer: _CacheWriter | None = None
+    try:
+        if cache_path is not None:
+            writer = _CacheWriter(cache_path)
+        if proc.stdout is not None:
+            async with aclosing(_read_lines(proc.stdout, writer)) as lines:
+                async for line in lines:
+                    yield line
+
+        returncode = await proc.wait()
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, cmd)
+        if writer is not None:
+            writer.commit()
+    finally:
+        if writer is not None:
+            writer.discard()
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+
+def _read_cached_log(path: Path) -> Iterator[bytes]:
+    """Read a cached log line by line.
+
+    A cache entry that turns out to be corrupt or has disappeared is
+    removed so that it is fetched again.
+
+    Args:
+        path: Cache file path
+
+    Yields:
+        Raw log lines including their trailing newline
+
+    Raises:
+        CacheReadError: If the entry cannot be read, possibly after some
+            of its lines have already been yielded
+    """
+    try:
+        with gzip.open(path, "rb") as f:
+            yield from f
+    except (OSError, EOFError) as e:
+        logger.warning(f"Failed to read cache {path}: {e}")
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as unlink_error:
+            logger.warning(f"Failed to remove cache {path}: {unlink_error}")
+        raise CacheReadError(path) from e
+
+
+async def iter_log_lines(
+    run_id: str,
+    repo: str,
+    attempt: int | None,
+    conclusion: str | None,
+    cache_dir: Path | None,
+    *,
+    refresh: bool = False,
+) -> AsyncGenerator[bytes, None]:
+    """Iterate over a run log, serving it from the cache when possible.
+
+    Only logs of completed runs are read from or written to the cache,
+    since the log of a run that is still in progress may grow. A re-run
+    keeps its run ID, so entries are keyed by attempt as well, and runs
+    whose attempt is unknown are not cached.
+
+    Args:
+        run_id: GitHub Actions run ID
+        repo: Repository name (owner/repo)
+        attempt: Run attempt, or None for the latest one
+        conclusion: Conclusion of the run, if known
+        cache_dir: Cache root directory, or None to disable caching
+        refresh: Fetch the log from gh even if it is cached, replacing
+            the cache entry
+
+    Yields:
+        Raw log lines including their trailing newline
+
+    Raises:
+        CacheReadError: If the cached entry cannot be read; the caller
+            should discard any lines seen so far and retry with refresh
+        subprocess.CalledProcessError: If the gh command fails
+    """
+    if (
+        cache_dir is None
+        or attempt is None
+        or conclusion not in CACHEABLE_CONCLUSIONS
+    ):
+        lines = _stream_log(run_id, repo, attempt, None)
+    else:
+        path = cache_dir / repo / f"{run_id}-{attempt}.log.gz"
+        if not refresh and path.exists():
+            for line in _read_cached_log(path):
+                yield line
+            return
+        lines = _stream_log(run_id, repo, attempt, path)
+
+    async with aclosing(lines):
+        async for line in lines:
+            yield line
@@ -3,109 +3,174 @@
 import json
 import re
 
+_DECODER = json.JSONDecoder()
 
-def _extract_json_part_from_log_line(line: str) -> str:
+_TIMESTAMP_PREFIX_RE = re.compile(
+    rb"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z\s+(.*)",
+)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
+
+def _extract_json_part_from_log_line(line: bytes) -> bytes:
     """Extract JSON content from a log line.
 
     Args:
-        line: A single log line
+        line: A single raw log line
 
     Returns:
-        Extracted JSON part as string
+        Extracted JSON part as bytes
     """
     # Extract JSON content after timestamp
     # Format: "review\tUNKNOWN STEP\t2025-12-17T23:51:16.7770671Z   "type": "result","
-    timestamp_match = re.search(
-        r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z\s+(.*)",
-        line,
-    )
+    # The timestamp normally starts right after the second tab, so try an
+    # anchored match there before searching the whole line
+    first_tab = line.find(b"\t")
+    second_tab = line.find(b"\t", first_tab + 1) if first_tab >= 0 else -1
+    timestamp_match = None
+    if second_tab >= 0:
+        timestamp_match = _TIMESTAMP_PREFIX_RE.match(line, second_tab + 1)
+    if timestamp_match is None:
+        timestamp_match = _TIMESTAMP_PREFIX_RE.search(line)
     if timestamp_match:
         return timestamp_match.group(1)
 
     # Fallback: get content after last tab
-    parts = line.split("\t")
+    parts = line.split(b"\t")
     if len(parts) >= 3:
         return parts[-1]
     return line.strip()
 
 
-def _prepare_json_string(json_parts: list[str]) -> str:
-    """Prepare JSON string from collected parts.
+def _decode_json_object(json_str: str) -> dict | None:
+    """Decode the JSON value at the start of a string.
+
+    Anything after the end of the value is ignored.
 
     Args:
-        json_parts: List of JSON string parts
+        json_str: String starting with a JSON value
 
     Returns:
-        Prepared JSON string starting with '{'
+        Decoded object, or None if the value is not an object
+
+    Raises:
+        json.JSONDecodeError: If the value is invalid or incomplete
     """
-    json_str = "".join(json_parts).strip()
-    if not json_str.startswith("{"):
-        first_brace = json_str.find("{")
-        if first_brace >= 0:
-            json_str = json_str[first_brace:]
-    return json_str
+    parsed, _ = _DECODER.raw_decode(json_str)
+    if isinstance(parsed, dict):
+        return parsed
+    return None
 
 
-def _parse_json_with_cleanup(json_str: str) -> dict | None:
-    """Parse JSON string with automatic cleanup for common issues.
+def _parse_json_with_cleanup(json_str: str) -> tuple[dict | None, bool]:
+    """Parse a JSON object with automatic cleanup for common issues.
 
     Args:
-        json_str: JSON string to parse
+        json_str: String starting with a JSON object
 
     Returns:
-        Parsed JSON object or None if parsing fails
+        Tuple of the parsed object (None if parsing fails) and whether
+        the string ends before the object does, i.e. more input is needed
     """
     try:
-        parsed = json.loads(json_str)
-        if isinstance(parsed, dict):
-            return parsed
-    except json.JSONDecodeError:
-        # Try to fix trailing commas
-        json_str = re.sub(r",\s*}", "}", json_str)
-        json_str = re.sub(r",\s*]", "]", json_str)
-        try:
-            parsed = json.loads(json_str)
-            if isinstance(parsed, dict):
-                return parsed
-        except json.JSONDecodeError:
-            pass
-    return None
+        return _decode_json_object(json_str), False
+    except json.JSONDecodeError as e:
+        if e.pos >= len(json_str):
+            return None, True
+
+    # Try to fix trailing commas in a single pass
+    if "," not in json_str:
+        return None, False
+    json_str = _TRAILING_COMMA_RE.sub(r"\1", json_str)
+    try:
+        return _decode_json_object(json_str), False
+    except json.JSONDecodeError as e:
+        return None, e.pos >= len(json_str)
+
+
+class MultilineJSONCollector:
+    """Incrementally reassemble a JSON object split across log lines.
+
+    Lines are fed one at a time, so the caller can stream a log without
+    keeping every line in memory. The collected text is handed to a real
+    JSON decoder, which also copes with braces inside string values.
+    """
+
+    def __init__(self, max_lines: int | None = None) -> None:
+        """Initialize an empty collector.
+
+        Args:
+            max_lines: Give up once this many lines have been collected
+                without completing the object, or None for no limit
+        """
+        self._json_parts: list[bytes] = []
+        self._result: dict | None = None
+        self._max_lines = max_lines
+        self.complete = False
+
+    def feed(self, line: bytes) -> bool:
+        """Add the next log line.
+
+        Args:
+            line: A single raw log line
+
+        Returns:
+            True once the object is complete or known to be unparsable
+        """
+        if self.complete:
+            return True
+
+        json_part = _extract_json_part_from_log_line(line)
+        if not self._json_parts:
+            # Skip everything before the opening brace
+            first_brace = json_part.find(b"{")
+            if first_brace < 0:
+                return False
+            json_part = json_part[first_brace:]
+        self._json_parts.append(json_part)
+
+        # The object can only end on a line with a closing brace
+        if b"}" not in json_part:
+            if (
+                self._max_lines is not None
+                and len(self._json_parts) >= self._max_lines
+            ):
+                self.complete = True
+            return self.complete
+
+        # Only the collected object is ever decoded, not the whole log
+        parsed, needs_more = _parse_json_with_cleanup(
+            b"".join(self._json_parts).decode("utf-8", errors="replace"),
+        )
+        if needs_more:
+            return False
+        self._result = parsed
+        self.complete = True
+        return True
+
+    def result(self) -> dict | None:
+        """Get the collected JSON object.
+
+        Returns:
+            Parsed JSON object or None if incomplete or unparsable
+        """
+        return self._result
 
 
 def extract_json_from_multiline_log(
-    log_lines: list[str],
+    log_lines: list[bytes],
     start_line_idx: int,
 ) -> dict | None:
     """Extract a complete JSON object from multiline log format.
 
     Args:
-        log_lines: List of log lines
+        log_lines: List of raw log lines
         start_line_idx: Starting index to begin extraction
 
     Returns:
         Parsed JSON object or None if extraction fails
     """
-    json_parts = []
-    brace_count = 0
-    found_opening_brace = False
-
-    for i in range(start_line_idx, len(log_lines)):
-        line = log_lines[i]
-        json_part = _extract_json_part_from_log_line(line)
-
-        # Count braces
-        open_braces = json_part.count("{")
-        close_braces = json_part.count("}")
-        brace_count += open_braces - close_braces
-
-        if open_braces > 0:
-            found_opening_brace = True
-
-        json_parts.append(json_part)
-
-        # If we found opening brace and brace count is 0, we have complete JSON
-        if found_opening_brace and brace_count == 0:
-            json_str = _prepare_json_string(json_parts)
-            return _parse_json_with_cleanup(json_str)
-
+    collector = MultilineJSONCollector()
+    for line in log_lines[start_line_idx:]:
+        if collector.feed(line):
+            return collector.result()
     return None
@@ -2,107 +2,348 @@
 
 import re
 import subprocess
+from collections import deque
+from collections.abc import AsyncGenerator, Callable, Iterable
+from contextlib import aclosing
+from pathlib import Path
 
 from loguru import logger
 
-from .log_parser import extract_json_from_multiline_log
+from .log_cache import CacheReadError, iter_log_lines
+from .log_parser import MultilineJSONCollector
 
+_METRIC_FIELDS = (
+    "run_id",
+    "model",
+    "total_cost_usd",
+    "duration_ms",
+    "num_turns",
+    "start_time",
+    "end_time",
+    "is_error",
+    "pr_number",
+    "pr_author",
+    "total_commits",
+    "changed_files",
+)
 
-def extract_metrics_from_log(run_id: str, repo: str) -> dict:  # noqa: C901
+# Number of lines before a result line searched for its opening brace
+_RESULT_LOOKBACK_LINES = 3
+
+# Lines collected for one result JSON candidate before giving up on it,
+# so an unterminated object cannot buffer the rest of the log
+_MAX_RESULT_JSON_LINES = 200
+
+# Lines are matched as raw bytes; only captured values are decoded
+_TIMESTAMP_RE = re.compile(rb"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z")
+_MODEL_LABEL = b'"model"'
+_MODEL_RE = re.compile(rb'"model"\s*:\s*"([^"]+)"')
+
+
+def _decode_stripped(value: bytes) -> str:
+    """Decode a captured log value and strip surrounding whitespace.
+
+    Args:
+        value: Raw bytes captured from a log line
+
+    Returns:
+        Decoded string with surrounding whitespace removed
+    """
+    return value.decode("utf-8", errors="replace").strip()
+
+
+_LabelledField = tuple[
+    bytes,
+    str,
+    re.Pattern[bytes],
+    Callable[[bytes], int | str],
+]
+
+# (label, field, pattern, converter) for PR metadata printed by the
+# workflow. A plain substring check on the label gates each regex, so
+# the vast majority of lines never reach the regex engine.
+_LABELLED_FIELDS: tuple[_LabelledField, ...] = (
+    (b"PR NUMBER:", "pr_number", re.compile(rb"PR NUMBER:\s*(\d+)"), int),
+    (
+        b"PR Author:",
+        "pr_author",
+        re.compile(rb"PR Author:\s*([^\n]+)"),
+        _decode_stripped,
+    ),
+    (
+        b"Total Commits:",
+        "total_commits",
+        re.compile(rb"Total Commits:\s*(\d+)"),
+        int,
+    ),
+    (
+        b"Changed Files:",
+        "changed_files",
+        re.compile(rb"Changed Files:\s*(\d+)\s*files?"),
+        int,
+    ),
+)
+
+
+def empty_metrics(run_id: str) -> dict:
+    """Create a metrics dictionary with every field unset.
+
+    Args:
+        run_id: GitHub Actions run ID
+
+    Returns:
+        Dictionary with all metric fields set to None except run_id
+    """
+    result: dict = dict.fromkeys(_METRIC_FIELDS)
+    result["run_id"] = run_id
+    return result
+
+
+def _scan_labelled_fields(
+    line: bytes,
+    result: dict,
+    pending: tuple[_LabelledField, ...],
+) -> tuple[_LabelledField, ...]:
+    """Fill labelled PR fields found in a log line.
+
+    The first match wins, so a field is no longer looked for once set.
+
+    Args:
+        line: A single raw log line
+        result: Metrics dictionary to update in place
+        pending: Labelled fields that have not been found yet
+
+    Returns:
+        Labelled fields still not found after this line
+    """
+    found = False
+    for label, field, pattern, convert in pending:
+        if label in line:
+            match = pattern.search(line)
+            if match:
+                result[field] = convert(match.group(1))
+                found = True
+    if not found:
+        return pending
+    return tuple(entry for entry in pending if result[entry[1]] is None)
+
+
+def _scan_model(line: bytes, result: dict) -> None:
+    """Record the model named in a log line; the last match wins.
+
+    Args:
+        line: A single raw log line
+        result: Metrics dictionary to update in place
+    """
+    # Search backwards from the last label instead of collecting every
+    # match just to keep the final one
+    idx = line.rfind(_MODEL_LABEL)
+    while idx != -1:
+        match = _MODEL_RE.match(line, idx)
+        if match:
+            result["model"] = match.group(1).decode("utf-8", errors="replace")
+            return
+        idx = line.rfind(_MODEL_LABEL, 0, idx)
+
+
+def _start_result_collector(
+    recent_lines: Iterable[bytes],
+    line: bytes,
+) -> MultilineJSONCollector:
+    """Start collecting the result JSON that contains the given line.
+
+    The JSON object may open a few lines before the `"type": "result"`
+    line, so collection starts at the earliest recent line with a brace.
+
+    Args:
+        recent_lines: Lines immediately preceding the result line
+        line: The line containing the result type
+
+    Returns:
+        Collector fed with the lines seen so far
+    """
+    pending = list(recent_lines)
+    start = next(
+        (k for k, prev in enumerate(pending) if b"{" in prev),
+        len(pending),
+    )
+    collector = MultilineJSONCollector(max_lines=_MAX_RESULT_JSON_LINES)
+    for pending_line in [*pending[start:], line]:
+        if collector.feed(pending_line):
+            break
+    return collector
+
+
+def _apply_result_json(json_obj: dict | None, result: dict) -> bool:
+    """Copy Claude Code result fields into the metrics dictionary.
+
+    Args:
+        json_obj: Parsed JSON object, if any
+        result: Metrics dictionary to update in place
+
+    Returns:
+        True if the object was a result JSON
+    """
+    if not json_obj or json_obj.get("type") != "result":
+        return False
+    result["total_cost_usd"] = json_obj.get("total_cost_usd")
+    result["duration_ms"] = json_obj.get("duration_ms")
+    result["num_turns"] = json_obj.get("num_turns")
+    result["is_error"] = json_obj.get("is_error", False)
+    return True
+
+
+class _LogScanner:
+    """Accumulate metrics from log lines fed one at a time."""
+
+    def __init__(self, result: dict) -> None:
+        """Initialize the scanner.
+
+        Args:
+            result: Metrics dictionary to update in place
+        """
+        self._result = result
+        self._recent_lines: deque[bytes] = deque(
+            maxlen=_RESULT_LOOKBACK_LINES,
+        )
+        # One collector per result line whose JSON is still incomplete
+        self._collectors: list[MultilineJSONCollector] = []
+        self._found_result = False
+        self._last_timestamp: bytes | None = None
+        self._pending_fields = _LABELLED_FIELDS
+
+    def feed(self, line: bytes) -> None:
+        """Process the next log line.
+
+        Args:
+            line: A single raw log line without its trailing newline
+        """
+        # Track timestamps; the last one is only decoded by finish()
+        timestamp_match = _TIMESTAMP_RE.search(line)
+        if timestamp_match:
+            self._last_timestamp = timestamp_match.group(0)
+            if self._result["start_time"] is None:
+                self._result["start_time"] = self._last_timestamp.decode()
+
+        # Extract labelled fields until all of them have been found.
+        # The model (last match wins) and the end time still need every
+        # line, so the scan itself cannot stop early.
+        if self._pending_fields:
+            self._pending_fields = _scan_labelled_fields(
+                line,
+                self._result,
+                self._pending_fields,
+            )
+        _scan_model(line, self._result)
+
+        # Extract result JSON
+        if not self._found_result:
+            self._feed_result_collectors(line)
+            # The lookback is only needed until the result is found
+            self._recent_lines.append(line)
+
+    def _feed_result_collectors(self, line: bytes) -> None:
+        """Collect result JSON candidates and apply the first valid one.
+
+        Every result line starts its own candidate, even while earlier
+        ones are still being collected, so a truncated result JSON does
+        not hide a complete one further down the log.
+
+        Args:
+            line: A single raw log line without its trailing newline
+        """
+        for collector in self._collectors:
+            collector.feed(line)
+        if b'"type"' in line and b'"result"' in line:
+            self._collectors.append(
+                _start_result_collector(self._recent_lines, line),
+            )
+
+        # Candidates are checked in the order their result lines appeared
+        for collector in self._collectors:
+            if collector.complete and _apply_result_json(
+                collector.result(),
+                self._result,
+            ):
+                self._found_result = True
+                self._collectors = []
+                return
+        self._collectors = [c for c in self._collectors if not c.complete]
+
+    def finish(self) -> None:
+        """Record the end time from the last timestamp seen."""
+        if self._last_timestamp is not None:
+            self._result["end_time"] = self._last_timestamp.decode()
+
+
+async def _scan_log(
+    lines: AsyncGenerator[bytes, None],
+    result: dict,
+) -> None:
+    """Feed every line of a log to a scanner.
+
+    The log is streamed so only a few recent lines are held in memory.
+
+    Args:
+        lines: Raw log lines including their trailing newline
+        result: Metrics dictionary to update in place
+    """
+    scanner = _LogScanner(result)
+    try:
+        async with aclosing(lines):
+            async for raw_line in lines:
+                scanner.feed(raw_line.removesuffix(b"\n"))
+    finally:
+        scanner.finish()
+
+
+async def extract_metrics_from_log(
+    run_id: str,
+    repo: str,
+    conclusion: str | None = None,
+    cache_dir: Path | None = None,
+    attempt: int | None = None,
+) -> dict:
     """Extract all metrics from a GitHub Actions run log.
 
     Args:
         run_id: GitHub Actions run ID
         repo: Repository name (owner/repo)
+        conclusion: Conclusion of the run, used to decide cacheability
+        cache_dir: Log cache directory, or None to disable caching
+        attempt: Run attempt to read, or None for the latest one
 
     Returns:
         Dictionary containing extracted metrics
     """
-    result: dict = {
-        "run_id": run_id,
-        "model": None,
-        "total_cost_usd": None,
-        "duration_ms": None,
-        "num_turns": None,
-        "start_time": None,
-        "end_time": None,
-        "is_error": None,
-        "pr_number": None,
-        "pr_author": None,
-        "total_commits": None,
-        "changed_files": None,
-    }
+    result = empty_metrics(run_id)
 
     try:
-        # Get log
-        cmd = ["gh", "run", "view", run_id, "--log", "--repo", repo]
-        log_output = subprocess.check_output(  # noqa: S603
-            cmd,
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
-        log_lines = log_output.split("\n")
-
-        # Extract PR number from log
-        pr_number_pattern = r"PR NUMBER:\s*(\d+)"
-        pr_match = re.search(pr_number_pattern, log_output)
-        if pr_match:
-            result["pr_number"] = int(pr_match.group(1))
-
-        # Extract PR Author from log
-        pr_author_pattern = r"PR Author:\s*([^\n]+)"
-        pr_author_match = re.search(pr_author_pattern, log_output)
-        if pr_author_match:
-            result["pr_author"] = pr_author_match.group(1).strip()
-
-        # Extract Total Commits from log
-        total_commits_pattern = r"Total Commits:\s*(\d+)"
-        total_commits_match = re.search(total_commits_pattern, log_output)
-        if total_commits_match:
-            result["total_commits"] = int(total_commits_match.group(1))
-
-        # Extract Changed Files from log
-        changed_files_pattern = r"Changed Files:\s*(\d+)\s*files?"
-        changed_files_match = re.search(changed_files_pattern, log_output)
-        if changed_files_match:
-            result["changed_files"] = int(changed_files_match.group(1))
-
-        # Extract model
-        model_pattern = r'"model"\s*:\s*"([^"]+)"'
-        model_matches = list(re.finditer(model_pattern, log_output))
-        if model_matches:
-            result["model"] = model_matches[-1].group(1)
-
-        # Extract result JSON
-        for i, line in enumerate(log_lines):
-            if '"type"' in line and '"result"' in line:
-                start_idx = i
-                for j in range(max(0, i - 3), i):
-                    if "{" in log_lines[j]:
-                        start_idx = j
-                        break
-
-                json_obj = extract_json_from_multiline_log(
-                    log_lines,
-                    start_idx,
-                )
-                if json_obj and json_obj.get("type") == "result":
-                    result["total_cost_usd"] = json_obj.get("total_cost_usd")
-                    result["duration_ms"] = json_obj.get("duration_ms")
-                    result["num_turns"] = json_obj.get("num_turns")
-                    result["is_error"] = json_obj.get("is_error", False)
-                    break
-
-        # Extract timestamps
-        timestamp_pattern = r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z)"
-        timestamps = re.findall(timestamp_pattern, log_output)
-
-        if timestamps:
-            result["start_time"] = timestamps[0]
-            result["end_time"] = timestamps[-1]
+        try:
+            await _scan_log(
+                iter_log_lines(run_id, repo, attempt, conclusion, cache_dir),
+                result,
+            )
+        except CacheReadError:
+            # Start over, since part of the cached log may have been read
+            logger.info(f"Fetching log for run {run_id} again")
+            result = empty_metrics(run_id)
+            await _scan_log(
+                iter_log_lines(
+                    run_id,
+                    repo,
+                    attempt,
+                    conclusion,
+                    cache_dir,
+                    refresh=True,
+                ),
+                result,
+            )
 
     except subprocess.CalledProcessError as e:
         logger.error(f"Error getting log for run {run_id}: {e}")
+        # The partial output was an error message, not a usable log
+        result = empty_metrics(run_id)
     except Exception as e:
         logger.error(f"Error processing run {run_id}: {e}")
 
@@ -1,52 +1,204 @@
 """Workflow run processing utilities."""
 
+import asyncio
 import re
+from operator import itemgetter
+from pathlib import Path
 
 from loguru import logger
 
-from .metrics_extractor import extract_metrics_from_log
+from .github_client import get_pull_requests
+from .metrics_extractor import empty_metrics, extract_metrics_from_log
 
+DEFAULT_CONCURRENCY = 16
 
-def process_runs(runs: list[dict], repo: str) -> list[dict]:
-    """Process workflow runs and extract metrics.
+# Runs with these conclusions never got to print a Claude Code result,
+# so their logs are not worth downloading
+_NO_RESULT_CONCLUSIONS = frozenset(
+    {"cancelled", "skipped", "startup_failure", "action_required", "neutral"},
+)
+
+# Number of finished runs between progress log messages
+_PROGRESS_INTERVAL = 50
+
+# PR number in a run's display title, used when the log lacks one
+_PR_NUM_RE = re.compile(r"#(\d+)")
+
+# Fields that can be taken from the pull request when a log lacks them
+_PR_METADATA_FIELDS = ("pr_author", "total_commits", "changed_files")
+
+
+def _fill_missing_pr_metadata(results: list[dict], repo: str) -> None:
+    """Fill PR metadata missing from logs with batched API lookups.
+
+    Args:
+        results: Processed result dictionaries, updated in place
+        repo: Repository name (owner/repo)
+    """
+    incomplete = [
+        r
+        for r in results
+        if r["pr_number"]
+        and any(r.get(field) is None for field in _PR_METADATA_FIELDS)
+    ]
+    if not incomplete:
+        return
+
+    pr_numbers = sorted({r["pr_number"] for r in incomplete})
+    logger.info(f"Fetching metadata for {len(pr_numbers)} pull requests...")
+    pull_requests = get_pull_requests(repo, pr_numbers)
+    for r in incomplete:
+        pull_request = pull_requests.get(r["pr_number"], {})
+        for field in _PR_METADATA_FIELDS:
+            if r.get(field) is None:
+                r[field] = pull_request.get(field)
+
+
+async def _extract_all_metrics(
+    runs: list[dict],
+    repo: str,
+    concurrency: int,
+    cache_dir: Path | None,
+) -> list[dict]:
+    """Extract metrics for all runs with bounded concurrency.
+
+    Duplicate run IDs share one extraction and its metrics dictionary,
+    which callers only read. Runs that cannot have a result
+    (cancelled, skipped, ...) get empty metrics without fetching a log.
 
     Args:
         runs: List of workflow run dictionaries
         repo: Repository name (owner/repo)
+        concurrency: Maximum number of logs fetched at the same time
+        cache_dir: Log cache directory, or None to disable caching
 
     Returns:
-        List of processed result dictionaries
+        Metrics dictionaries in the same order as runs
     """
-    results = []
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    total = len({str(run["databaseId"]) for run in runs})
+    done = 0
+
+    async def fetch(run: dict) -> dict:
+        run_id = str(run["databaseId"])
+        if run.get("conclusion") in _NO_RESULT_CONCLUSIONS:
+            return empty_metrics(run_id)
+        async with semaphore:
+            return await extract_metrics_from_log(
+                run_id,
+                repo,
+                run.get("conclusion"),
+                cache_dir,
+                run.get("attempt"),
+            )
+
+    async def extract(run: dict) -> dict:
+        nonlocal done
+        metrics = await fetch(run)
+        # Report progress in batches rather than once per run
+        done += 1
+        if done % _PROGRESS_INTERVAL == 0 or done == total:
+            logger.info(f"Processed {done}/{total} runs")
+        return metrics
+
+    logger.info(f"Processing {total} runs...")
 
+    # A run listed more than once is fetched and parsed only once
+    tasks: dict[str, asyncio.Task[dict]] = {}
     for run in runs:
         run_id = str(run["databaseId"])
-        pr_name = run.get("displayTitle", "N/A")
-        branch = run.get("headBranch", "N/A")
-        status = run.get("conclusion", "unknown")
-
-        logger.info(f"Processing run {run_id}...")
-        metrics = extract_metrics_from_log(run_id, repo)
-
-        # Use PR number from log if available, otherwise try to extract from displayTitle
-        pr_number = metrics.get("pr_number")
-        if not pr_number:
-            pr_match = re.search(r"#(\d+)", pr_name)
-            if pr_match:
-                pr_number = int(pr_match.group(1))
-
-        results.append(
-            {
-                "run_id": run_id,
-                "pr_name": pr_name,
-                "pr_number": pr_number,
-                "branch": branch,
-                "status": status,
-                **{k: v for k, v in metrics.items() if k != "pr_number"},
-            },
-        )
-
-    # Sort by start_time descending (most recent first)
-    results.sort(key=lambda x: x.get("start_time", "") or "", reverse=True)
-
-    return results
+        if run_id not in tasks:
+            tasks[run_id] = asyncio.create_task(extract(run))
+    metrics_by_id = dict(
+        zip(tasks, await asyncio.gather(*tasks.values()), strict=True),
+    )
+    return [metrics_by_id[str(run["databaseId"])] for run in runs]
+
+
+def _assemble_result(run: dict, metrics: dict) -> dict:
+    """Combine a workflow run with the metrics extracted from its log.
+
+    Args:
+        run: Workflow run dictionary
+        metrics: Metrics dictionary extracted from the run's log
+
+    Returns:
+        Processed result dictionary
+    """
+    pr_name = run.get("displayTitle", "N/A")
+
+    # Use PR number from log if available, otherwise try to extract from displayTitle
+    pr_number = metrics["pr_number"]
+    # The substring check skips the regex for titles without a "#"
+    if not pr_number and "#" in pr_name:
+        pr_match = _PR_NUM_RE.search(pr_name)
+        if pr_match:
+            pr_number = int(pr_match.group(1))
+
+    # Every field is listed explicitly; run timestamps stand in for
+    # ones missing from the log
+    return {
+        "run_id": str(run["databaseId"]),
+        "pr_name": pr_name,
+        "pr_number": pr_number,
+        "branch": run.get("headBranch", "N/A"),
+        "status": run.get("conclusion", "unknown"),
+        "model": metrics["model"],
+        "total_cost_usd": metrics["total_cost_usd"],
+        "duration_ms": metrics["duration_ms"],
+        "num_turns": metrics["num_turns"],
+        "start_time": metrics["start_time"] or run.get("startedAt"),
+        "end_time": metrics["end_time"] or run.get("updatedAt"),
+        "is_error": metrics["is_error"],
+        "pr_author": metrics["pr_author"],
+        "total_commits": metrics["total_commits"],
+        "changed_files": metrics["changed_files"],
+    }
+
+
+def process_runs(
+    runs: list[dict],
+    repo: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache_dir: Path | None = None,
+    *,
+    sort: bool = True,
+) -> list[dict]:
+    """Process workflow runs and extract metrics.
+
+    Logs are fetched concurrently with asyncio subprocesses because each
+    fetch is a network-bound `gh` call; results are then assembled on
+    the calling thread in the original run order. PR metadata missing
+    from the logs is looked up with batched GraphQL requests (one per
+    PR_BATCH_SIZE pull requests), and run timestamps stand in for
+    missing log ones.
+
+    Args:
+        runs: List of workflow run dictionaries
+        repo: Repository name (owner/repo)
+        concurrency: Maximum number of logs fetched at the same time
+        cache_dir: Log cache directory, or None to disable caching
+        sort: Sort results by start time, most recent first; pass False
+            to keep the order of runs
+
+    Returns:
+        List of processed result dictionaries
+    """
+    metrics_list = asyncio.run(
+        _extract_all_metrics(runs, repo, concurrency, cache_dir),
+    )
+    results = [
+        _assemble_result(run, metrics)
+        for run, metrics in zip(runs, metrics_list, strict=True)
+    ]
+
+    _fill_missing_pr_metadata(results, repo)
+    if not sort:
+        return results
+
+    # Sort by start_time descending (most recent first). Results without
+    # a start time keep their order at the end; they stay None rather
+    # than "" so the JSON output is unchanged.
+    dated = [r for r in results if r["start_time"]]
+    dated.sort(key=itemgetter("start_time"), reverse=True)
+    return dated + [r for r in results if not r["start_time"]]
@@ -1,92 +1,178 @@
 """CSV report generation utilities."""
 
 import csv
+import functools
+import sys
+from collections.abc import Iterable
+from operator import itemgetter
 from pathlib import Path
 
 from .formatters import format_duration, format_timestamp
 
+# Placeholder for missing values in the cells this module fills itself;
+# formatters.py returns its own "N/A"
+_NA = sys.intern("N/A")
+
+# Model names shortened in the report
+MODEL_ALIASES = {"claude-sonnet-4-5-20250929": "sonnet-4.5"}
+
+
+@functools.cache
+def _rename_model(model: str) -> str:
+    """Apply MODEL_ALIASES to a model name.
+
+    Reports usually repeat a handful of models, so each distinct name
+    is only rewritten once.
+
+    Args:
+        model: Model name
+
+    Returns:
+        Model name with every alias applied
+    """
+    for name, alias in MODEL_ALIASES.items():
+        model = model.replace(name, alias)
+    return model
+
+
+def _format_model(model: str | None) -> str:
+    """Shorten a model name using MODEL_ALIASES.
+
+    Args:
+        model: Model name
+
+    Returns:
+        Shortened model name or "N/A"
+    """
+    if not model:
+        return _NA
+    return _rename_model(model)
+
+
+def _format_cost(cost: float | None) -> str:
+    """Format a cost in USD with four decimals.
+
+    Args:
+        cost: Cost in USD
+
+    Returns:
+        Formatted cost or "N/A"
+    """
+    return f"{cost:.4f}" if cost is not None else _NA
+
+
+# Result keys for every CSV column except the PR link, fetched with one
+# itemgetter call; results from process_runs always carry every key
+_get_row_values = itemgetter(
+    "pr_number",
+    "pr_name",
+    "pr_author",
+    "branch",
+    "model",
+    "total_cost_usd",
+    "duration_ms",
+    "num_turns",
+    "total_commits",
+    "changed_files",
+    "status",
+    "start_time",
+    "end_time",
+)
+
+# Output buffer size; coalesces the CSV writer's many small writes
+_WRITE_BUFFER_BYTES = 1 << 20
+
+# CSV header, in the order of the row built by _build_row
+_CSV_HEADER: tuple[str, ...] = (
+    "PR番号",
+    "PR名",
+    "PR Author",
+    "ブランチ",
+    "モデル",
+    "コスト (USD)",
+    "処理時間",
+    "ターン数",
+    "コミット数",
+    "ファイル変更数",
+    "実行ステータス",
+    "開始時刻",
+    "終了時刻",
+    "PRリンク",
+)
+
+
+def _build_row(result: dict, pr_url_prefix: str) -> list:
+    """Build one CSV row from a result dictionary.
+
+    Plain columns only need "N/A" for missing values and are handled
+    inline; formatter calls are kept for the columns that need them.
+
+    Args:
+        result: Processed result dictionary
+        pr_url_prefix: Repository PR URL up to the number
+
+    Returns:
+        Formatted values for every CSV column
+    """
+    (
+        pr_number,
+        pr_name,
+        pr_author,
+        branch,
+        model,
+        total_cost_usd,
+        duration_ms,
+        num_turns,
+        total_commits,
+        changed_files,
+        status,
+        start_time,
+        end_time,
+    ) = _get_row_values(result)
+    return [
+        pr_number or _NA,
+        pr_name or _NA,
+        pr_author or _NA,
+        branch or _NA,
+        _format_model(model),
+        _format_cost(total_cost_usd),
+        format_duration(duration_ms),
+        num_turns or _NA,
+        total_commits or _NA,
+        changed_files or _NA,
+        status or _NA,
+        format_timestamp(start_time),
+        format_timestamp(end_time),
+        f"{pr_url_prefix}{pr_number}" if pr_number else _NA,
+    ]
+
 
 def generate_csv_report(
-    results: list[dict],
+    results: Iterable[dict],
     output_file: Path,
     repo: str,
 ) -> None:
     """Generate a CSV report from the results.
 
+    The results are iterated once and written row by row, so they may
+    also come from a generator.
+
     Args:
-        results: List of result dictionaries
+        results: Result dictionaries in report order
         output_file: Output file path
         repo: Repository name (owner/repo)
     """
-    with output_file.open("w", encoding="utf-8", newline="") as f:
+    pr_url_prefix = f"https://github.com/{repo}/pull/"
+
+    with output_file.open(
+        "w",
+        encoding="utf-8",
+        newline="",
+        buffering=_WRITE_BUFFER_BYTES,
+    ) as f:
         writer = csv.writer(f)
 
-        # Write header
-        writer.writerow(
-            [
-                "PR番号",
-                "PR名",
-                "PR Author",
-                "ブランチ",
-                "モデル",
-                "コスト (USD)",
-                "処理時間",
-                "ターン数",
-                "コミット数",
-                "ファイル変更数",
-                "実行ステータス",
-                "開始時刻",
-                "終了時刻",
-                "PRリンク",
-            ],
-        )
-
-        # Write data rows
-        for r in results:
-            pr_number = r.get("pr_number", "N/A") or "N/A"
-            pr_name = r.get("pr_name", "N/A") or "N/A"
-            pr_author = r.get("pr_author", "N/A") or "N/A"
-            branch = r.get("branch", "N/A") or "N/A"
-
-            model = r.get("model", "N/A") or "N/A"
-            if model != "N/A":
-                model = model.replace(
-                    "claude-sonnet-4-5-20250929",
-                    "sonnet-4.5",
-                )
-
-            cost = r.get("total_cost_usd")
-            cost_str = f"{cost:.4f}" if cost is not None else "N/A"
-
-            duration_str = format_duration(r.get("duration_ms"))
-            turns = r.get("num_turns", "N/A") or "N/A"
-            total_commits = r.get("total_commits", "N/A") or "N/A"
-            changed_files = r.get("changed_files", "N/A") or "N/A"
-            status = r.get("status", "N/A") or "N/A"
-            start_time = format_timestamp(r.get("start_time"))
-            end_time = format_timestamp(r.get("end_time"))
-
-            # Create PR link
-            if pr_number != "N/A" and pr_number:
-                pr_link = f"https://github.com/{repo}/pull/{pr_number}"
-            else:
-                pr_link = "N/A"
-
-            writer.writerow(
-                [
-                    pr_number,
-                    pr_name,
-                    pr_author,
-                    branch,
-                    model,
-                    cost_str,
-                    duration_str,
-                    turns,
-                    total_commits,
-                    changed_files,
-                    status,
-                    start_time,
-                    end_time,
-                    pr_link,
-                ],
-            )
+        writer.writerow(_CSV_HEADER)
+
+        # Write data rows; the generator lets the writer stream them
+        writer.writerows(_build_row(r, pr_url_prefix) for r in results)
@@ -0,0 +1,164 @@
+"""Shared fixtures for the test suite."""
+
+import asyncio
+import re
+import subprocess
+from typing import Any
+
+import orjson
+import pytest
+
+_PR_NUMBER_RE = re.compile(r"pullRequest\(number: (\d+)\)")
+
+
+class FakeGh:
+    """Stand-in for the gh processes started by the log cache.
+
+    Attributes:
+        output: Data the process writes to stdout
+        returncode: Exit status the process reports
+        calls: Command line of every process started
+    """
+
+    def __init__(self) -> None:
+        """Initialize with a successful, empty log."""
+        self.output = b""
+        self.returncode = 0
+        self.calls: list[tuple[str, ...]] = []
+
+    async def create_subprocess_exec(
+        self,
+        *cmd: str,
+        **kwargs: Any,
+    ) -> "_FakeProcess":
+        """Record the command and start a fake process.
+
+        Args:
+            *cmd: Command line
+            **kwargs: Ignored subprocess options
+
+        Returns:
+            The fake process
+        """
+        self.calls.append(cmd)
+        return _FakeProcess(self.output, self.returncode)
+
+
+class _FakeProcess:
+    """Fake asyncio process whose output is available immediately."""
+
+    def __init__(self, output: bytes, returncode: int) -> None:
+        """Initialize the process.
+
+        Args:
+            output: Data written to stdout
+            returncode: Exit status reported by wait()
+        """
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_data(output)
+        self.stdout.feed_eof()
+        self.returncode: int | None = None
+        self._exit_status = returncode
+
+    async def wait(self) -> int:
+        """Exit with the configured status.
+
+        Returns:
+            The exit status
+        """
+        self.returncode = self._exit_status
+        return self.returncode
+
+    def kill(self) -> None:
+        """Terminate the process."""
+        self.returncode = -9
+
+
+@pytest.fixture
+def fake_gh(monkeypatch: pytest.MonkeyPatch) -> FakeGh:
+    """Replace asyncio.create_subprocess_exec with a fake gh.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+
+    Returns:
+        The fake, to configure output and inspect calls
+    """
+    gh = FakeGh()
+    monkeypatch.setattr(
+        asyncio,
+        "create_subprocess_exec",
+        gh.create_subprocess_exec,
+    )
+    return gh
+
+
+class FakeGraphql:
+    """Stand-in for ``gh api graphql`` pull request lookups.
+
+    Pull request N is authored by ``user<N>`` and has N commits and
+    N + 1 changed files. Numbers listed in ``issues`` resolve to null,
+    as they do on GitHub, and make gh exit non-zero while still
+    printing the data for the others.
+
+    Attributes:
+        issues: Numbers that belong to issues rather than pull requests
+        batches: Pull request numbers requested by each call
+    """
+
+    def __init__(self) -> None:
+        """Initialize with every number being a pull request."""
+        self.issues: set[int] = set()
+        self.batches: list[list[int]] = []
+
+    def run(
+        self,
+        cmd: list[str],
+        **kwargs: Any,
+    ) -> subprocess.CompletedProcess[bytes]:
+        """Answer a GraphQL query for pull requests.
+
+        Args:
+            cmd: gh command line, with the query as its last argument
+            **kwargs: Ignored subprocess options
+
+        Returns:
+            The completed fake process
+        """
+        numbers = [int(n) for n in _PR_NUMBER_RE.findall(cmd[-1])]
+        self.batches.append(numbers)
+        repository = {
+            f"pr{n}": (
+                None
+                if n in self.issues
+                else {
+                    "number": n,
+                    "author": {"login": f"user{n}"},
+                    "commits": {"totalCount": n},
+                    "changedFiles": n + 1,
+                }
+            )
+            for n in numbers
+        }
+        missing = any(n in self.issues for n in numbers)
+        return subprocess.CompletedProcess(
+            cmd,
+            1 if missing else 0,
+            stdout=orjson.dumps({"data": {"repository": repository}}),
+            stderr=b"Could not resolve to a PullRequest" if missing else b"",
+        )
+
+
+@pytest.fixture
+def fake_graphql(monkeypatch: pytest.MonkeyPatch) -> FakeGraphql:
+    """Replace subprocess.run with a fake GraphQL endpoint.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+
+    Returns:
+        The fake, to configure issues and inspect requested batches
+    """
+    graphql = FakeGraphql()
+    monkeypatch.setattr(subprocess, "run", graphql.run)
+    return graphql
@@ -0,0 +1,34 @@
+"""Tests for the GitHub CLI client."""
+
+from src.github_client import PR_BATCH_SIZE, get_pull_requests
+from tests.conftest import FakeGraphql
+
+
+def test_pull_requests_are_batched(fake_graphql: FakeGraphql) -> None:
+    """Each GraphQL request asks for at most PR_BATCH_SIZE PRs."""
+    pr_numbers = list(range(1, 2 * PR_BATCH_SIZE + 2))
+
+    pull_requests = get_pull_requests("owner/repo", pr_numbers)
+
+    assert [len(batch) for batch in fake_graphql.batches] == [
+        PR_BATCH_SIZE,
+        PR_BATCH_SIZE,
+        1,
+    ]
+    assert sorted(pull_requests) == pr_numbers
+
+
+def test_pull_request_fields(fake_graphql: FakeGraphql) -> None:
+    """GraphQL fields are mapped to the metric field names."""
+    assert get_pull_requests("owner/repo", [5]) == {
+        5: {"pr_author": "user5", "total_commits": 5, "changed_files": 6},
+    }
+
+
+def test_issue_numbers_are_skipped(fake_graphql: FakeGraphql) -> None:
+    """PRs found are kept when gh fails because a number is an issue."""
+    fake_graphql.issues = {6}
+
+    pull_requests = get_pull_requests("owner/repo", [5, 6, 7])
+
+    assert sorted(pull_requests) == [5, 7]
@@ -0,0 +1,204 @@
+"""Tests for the run log cache."""
+
+import asyncio
+import gzip
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src import log_cache
+from src.log_cache import _CacheWriter, _pop_lines, _read_lines, iter_log_lines
+from tests.conftest import FakeGh
+
+_LOG = b"job\tstep\tline 1\njob\tstep\tline 2\n"
+
+_LINES = [b"job\tstep\tline 1\n", b"job\tstep\tline 2\n"]
+
+_SPLIT_LINES = [b"first\r\n", b"a longer second line\n", b"\n", b"no newline"]
+
+
+def _collect(
+    cache_dir: Path | None,
+    attempt: int | None = 2,
+    conclusion: str | None = "success",
+) -> list[bytes]:
+    """Read every line of run 123's log.
+
+    Args:
+        cache_dir: Cache root directory, or None to disable caching
+        attempt: Run attempt
+        conclusion: Conclusion of the run
+
+    Returns:
+        Raw log lines
+    """
+
+    async def collect() -> list[bytes]:
+        lines = iter_log_lines(
+            "123",
+            "owner/repo",
+            attempt,
+            conclusion,
+            cache_dir,
+        )
+        return [line async for line in lines]
+
+    return asyncio.run(collect())
+
+
+def _cache_files(cache_dir: Path) -> list[Path]:
+    """List every file under a cache directory.
+
+    Args:
+        cache_dir: Cache root directory
+
+    Returns:
+        Paths of all files, including temporary ones
+    """
+    return [path for path in cache_dir.rglob("*") if path.is_file()]
+
+
+def test_pop_lines_keeps_incomplete_tail() -> None:
+    """Complete lines are removed from the buffer, the tail stays."""
+    buf = bytearray(b"one\r\ntwo\nthr")
+
+    assert _pop_lines(buf) == [b"one\r\n", b"two\n"]
+    assert buf == b"thr"
+    assert _pop_lines(buf) == []
+    assert buf == b"thr"
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7, 64])
+def test_read_lines_across_chunks(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    read_size: int,
+) -> None:
+    """Lines are split the same way whatever the read size.
+
+    Args:
+        tmp_path: Directory for the cache entry
+        monkeypatch: pytest monkeypatch fixture
+        read_size: Bytes requested by each read from the stream
+    """
+    monkeypatch.setattr(log_cache, "_READ_CHUNK_BYTES", read_size)
+    data = b"".join(_SPLIT_LINES)
+    entry = tmp_path / "entry.log.gz"
+
+    async def split() -> list[bytes]:
+        stream = asyncio.StreamReader()
+        stream.feed_data(data)
+        stream.feed_eof()
+        writer = _CacheWriter(entry)
+        lines = [line async for line in _read_lines(stream, writer)]
+        writer.commit()
+        return lines
+
+    assert asyncio.run(split()) == _SPLIT_LINES
+    assert gzip.decompress(entry.read_bytes()) == data
+
+
+def test_log_is_cached_by_attempt(tmp_path: Path, fake_gh: FakeGh) -> None:
+    """A completed run's log is fetched once and keyed by its attempt."""
+    fake_gh.output = _LOG
+
+    assert _collect(tmp_path) == _LINES
+
+    assert fake_gh.calls == [
+        (
+            "gh",
+            "run",
+            "view",
+            "123",
+            "--log",
+            "--repo",
+            "owner/repo",
+            "--attempt",
+            "2",
+        ),
+    ]
+    entry = tmp_path / "owner" / "repo" / "123-2.log.gz"
+    assert _cache_files(tmp_path) == [entry]
+    assert gzip.decompress(entry.read_bytes()) == _LOG
+
+
+def test_cached_log_is_read_back(tmp_path: Path, fake_gh: FakeGh) -> None:
+    """A cached log is served without running gh."""
+    entry = tmp_path / "owner" / "repo" / "123-2.log.gz"
+    entry.parent.mkdir(parents=True)
+    entry.write_bytes(gzip.compress(_LOG))
+
+    assert _collect(tmp_path) == _LINES
+    assert fake_gh.calls == []
+
+
+def test_other_attempt_is_not_served_from_cache(
+    tmp_path: Path,
+    fake_gh: FakeGh,
+) -> None:
+    """A re-run is fetched again instead of reusing the first attempt."""
+    entry = tmp_path / "owner" / "repo" / "123-1.log.gz"
+    entry.parent.mkdir(parents=True)
+    entry.write_bytes(gzip.compress(b"first attempt\n"))
+    fake_gh.output = _LOG
+
+    assert _collect(tmp_path) == _LINES
+    assert len(fake_gh.calls) == 1
+
+
+@pytest.mark.parametrize(
+    ("attempt", "conclusion"),
+    [(None, "success"), (2, None), (2, "startup_failure")],
+)
+def test_log_is_not_cached(
+    tmp_path: Path,
+    fake_gh: FakeGh,
+    attempt: int | None,
+    conclusion: str | None,
+) -> None:
+    """Logs are not cached without an attempt or a final conclusion.
+
+    Args:
+        tmp_path: Cache root directory
+        fake_gh: Fake gh CLI
+        attempt: Run attempt
+        conclusion: Conclusion of the run
+    """
+    fake_gh.output = _LOG
+
+    assert _collect(tmp_path, attempt, conclusion) == _LINES
+    assert _cache_files(tmp_path) == []
+
+
+def test_log_is_published_after_gh_exits(
+    tmp_path: Path,
+    fake_gh: FakeGh,
+) -> None:
+    """The cache entry only appears once gh has exited successfully."""
+    fake_gh.output = _LOG
+    entry = tmp_path / "owner" / "repo" / "123-2.log.gz"
+
+    async def consume() -> None:
+        lines = iter_log_lines("123", "owner/repo", 2, "success", tmp_path)
+        for expected in _LINES:
+            assert await anext(lines) == expected
+            assert not entry.exists()
+        with pytest.raises(StopAsyncIteration):
+            await anext(lines)
+
+    asyncio.run(consume())
+    assert entry.exists()
+
+
+def test_failed_gh_leaves_no_cache_file(
+    tmp_path: Path,
+    fake_gh: FakeGh,
+) -> None:
+    """Output of a failed gh command is discarded, temp file included."""
+    fake_gh.output = b"HTTP 502: Bad Gateway\n"
+    fake_gh.returncode = 1
+
+    with pytest.raises(subprocess.CalledProcessError):
+        _collect(tmp_path)
+    assert _cache_files(tmp_path) == []
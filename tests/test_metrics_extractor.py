@@ -0,0 +1,110 @@
+"""Tests for metrics extraction from GitHub Actions logs."""
+
+import asyncio
+import gzip
+from pathlib import Path
+
+from src.metrics_extractor import (
+    _MAX_RESULT_JSON_LINES,
+    _LogScanner,
+    empty_metrics,
+    extract_metrics_from_log,
+)
+from tests.conftest import FakeGh
+
+_PREFIX = b"review\tUNKNOWN STEP\t2025-12-22T08:53:37.0000000Z "
+
+_RESULT_BLOCK = (
+    b"{",
+    b'  "type": "result",',
+    b'  "subtype": "success",',
+    b'  "total_cost_usd": 0.5679,',
+    b'  "duration_ms": 123456,',
+    b'  "num_turns": 7,',
+    b'  "is_error": false',
+    b"}",
+)
+
+
+def _scan(contents: list[bytes]) -> dict:
+    """Run the scanner over log line contents.
+
+    Args:
+        contents: Log line contents without the job/step/time prefix
+
+    Returns:
+        Extracted metrics
+    """
+    result = empty_metrics("1")
+    scanner = _LogScanner(result)
+    for content in contents:
+        scanner.feed(_PREFIX + content)
+    scanner.finish()
+    return result
+
+
+def _assert_result_found(result: dict) -> None:
+    """Check that the result block's fields were extracted.
+
+    Args:
+        result: Extracted metrics
+    """
+    assert result["total_cost_usd"] == 0.5679
+    assert result["duration_ms"] == 123456
+    assert result["num_turns"] == 7
+    assert result["is_error"] is False
+
+
+def test_multiline_result_json() -> None:
+    """A result JSON split across log lines is reassembled."""
+    _assert_result_found(_scan([b"filler", *_RESULT_BLOCK, b"tail"]))
+
+
+def test_truncated_result_before_complete_one() -> None:
+    """A truncated result JSON does not hide a later complete one."""
+    filler = [b"filler %d" % i for i in range(5)]
+    result = _scan(
+        [
+            b'{"type": "result", "note": "truncated',
+            *filler,
+            *_RESULT_BLOCK,
+            b"tail",
+        ],
+    )
+    _assert_result_found(result)
+
+
+def test_unterminated_result_is_abandoned() -> None:
+    """A result JSON that never closes stops being collected."""
+    filler = [b"filler %d" % i for i in range(_MAX_RESULT_JSON_LINES + 5)]
+    result = _scan([b'{"type": "result",', *filler, *_RESULT_BLOCK])
+    _assert_result_found(result)
+
+
+def test_unreadable_cache_entry_falls_back_to_gh(
+    tmp_path: Path,
+    fake_gh: FakeGh,
+) -> None:
+    """A truncated cache entry is discarded and the log fetched again."""
+    stale = _PREFIX + b"PR Author: stale\n"
+    entry = tmp_path / "owner" / "repo" / "1-1.log.gz"
+    entry.parent.mkdir(parents=True)
+    # Every line decompresses before the missing gzip trailer is noticed
+    entry.write_bytes(gzip.compress(stale * 100)[:-8])
+    log = _PREFIX + b"PR NUMBER: 7\n"
+    fake_gh.output = log
+
+    result = asyncio.run(
+        extract_metrics_from_log(
+            "1",
+            "owner/repo",
+            conclusion="success",
+            cache_dir=tmp_path,
+            attempt=1,
+        ),
+    )
+
+    assert result["pr_number"] == 7
+    assert result["pr_author"] is None
+    assert len(fake_gh.calls) == 1
+    assert gzip.decompress(entry.read_bytes()) == log
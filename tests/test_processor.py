@@ -0,0 +1,63 @@
+"""Tests for workflow run processing."""
+
+from src.metrics_extractor import empty_metrics
+from src.processor import _fill_missing_pr_metadata
+from tests.conftest import FakeGraphql
+
+
+def _metrics(run_id: str, pr_number: int | None, **fields: object) -> dict:
+    """Build metrics as extracted from a log.
+
+    Args:
+        run_id: GitHub Actions run ID
+        pr_number: PR number found in the log
+        **fields: Other fields found in the log
+
+    Returns:
+        Metrics dictionary
+    """
+    result = empty_metrics(run_id)
+    result.update(pr_number=pr_number, **fields)
+    return result
+
+
+def test_missing_pr_metadata_is_filled(fake_graphql: FakeGraphql) -> None:
+    """Only fields the log left unset are taken from the API."""
+    fake_graphql.issues = {6}
+    partial = _metrics("1", 5, pr_author="from-log", changed_files=3)
+    issue = _metrics("2", 6)
+    no_pr = _metrics("3", None)
+    complete = _metrics(
+        "4",
+        7,
+        pr_author="from-log",
+        total_commits=1,
+        changed_files=2,
+    )
+
+    _fill_missing_pr_metadata([partial, issue, no_pr, complete], "o/r")
+
+    assert fake_graphql.batches == [[5, 6]]
+    assert partial["pr_author"] == "from-log"
+    assert partial["total_commits"] == 5
+    assert partial["changed_files"] == 3
+    assert issue == _metrics("2", 6)
+    assert no_pr == _metrics("3", None)
+    assert complete["pr_author"] == "from-log"
+
+
+def test_complete_pr_metadata_is_not_fetched(
+    fake_graphql: FakeGraphql,
+) -> None:
+    """No request is made when every log had its PR metadata."""
+    complete = _metrics(
+        "1",
+        5,
+        pr_author="from-log",
+        total_commits=1,
+        changed_files=2,
+    )
+
+    _fill_missing_pr_metadata([complete], "o/r")
+
+    assert fake_graphql.batches == []